@@ -9,129 +9,670 @@ This module implements the core DES algorithm with all its components:
 - The overall structure with 16 rounds
 """
 
+import logging
+import struct
+from functools import lru_cache
+from operator import itemgetter
+
+# Debug traces of intermediate values; only emitted by DES(key, debug=True)
+_log = logging.getLogger(__name__)
+
+# Big-endian unsigned 64-bit layout of a single key or block
+_U64 = struct.Struct('>Q')
+
+# Bit masks for the value widths used by DES
+_M6 = 0x3F
+_M28 = (1 << 28) - 1
+_M32 = (1 << 32) - 1
+_M56 = (1 << 56) - 1
+
+
+def _compile_permutation(table, width):
+    """
+    Build a function that applies a permutation table to an integer.
+
+    The table uses the 1-based, most-significant-bit-first numbering of the
+    DES standard. Every output bit becomes one shift-and-mask term, and the
+    terms are OR'd together into a single expression that is compiled once,
+    so applying the permutation costs no Python-level loop.
+
+    Args:
+        table (sequence): Permutation table (1-based source bit positions)
+        width (int): Bit width of the input integer
+
+    Returns:
+        function: Callable mapping a width-bit int to a len(table)-bit int
+    """
+    out_width = len(table)
+    terms = [f"(((b >> {width - src}) & 1) << {out_width - 1 - i})"
+             for i, src in enumerate(table)]
+    return eval(f"lambda b: {' | '.join(terms)}")
+
+
+def _build_byte_tables(table, width):
+    """
+    Split a permutation table into per-input-byte lookup tables.
+
+    For each byte of the input a 256-entry table holds the permuted
+    contribution of every possible value of that byte, so the permutation
+    is the OR of one lookup per input byte.
+
+    Args:
+        table (sequence): Permutation table (1-based source bit positions)
+        width (int): Bit width of the input integer, a multiple of 8
+
+    Returns:
+        tuple: width // 8 tables of 256 ints, most significant byte first
+    """
+    out_width = len(table)
+    
+    # Output bits fed by each input bit (E uses some inputs twice)
+    contribution = [0] * (width + 1)
+    for i, src in enumerate(table):
+        contribution[src] |= 1 << (out_width - 1 - i)
+    
+    byte_tables = []
+    for k in range(width // 8):
+        # Bit 0 (LSB) of this byte is source position 8 * (k + 1)
+        bits = [contribution[8 * (k + 1) - j] for j in range(8)]
+        entries = [0] * 256
+        for v in range(1, 256):
+            low = v & -v
+            entries[v] = entries[v ^ low] | bits[low.bit_length() - 1]
+        byte_tables.append(tuple(entries))
+    return tuple(byte_tables)
+
+
+def _byte_lookup_source(tables, value, width):
+    """Source of an expression ORing one lookup per byte of value, MSB first."""
+    terms = []
+    for k, name in enumerate(tables):
+        shift = width - 8 * (k + 1)
+        if k == 0:
+            terms.append(f"{name}[{value} >> {shift}]")
+        elif shift:
+            terms.append(f"{name}[({value} >> {shift}) & 0xFF]")
+        else:
+            terms.append(f"{name}[{value} & 0xFF]")
+    return " | ".join(terms)
+
+
+def _compile_byte_permutation(table, width):
+    """
+    Build a function that applies a permutation table one input byte at a time.
+
+    The permutation becomes one lookup per input byte into the tables from
+    _build_byte_tables, OR'd together, instead of one shift-and-mask term
+    per output bit.
+
+    Args:
+        table (sequence): Permutation table (1-based source bit positions)
+        width (int): Bit width of the input integer, a multiple of 8
+
+    Returns:
+        function: Callable mapping a width-bit int to a len(table)-bit int
+    """
+    byte_tables = _build_byte_tables(table, width)
+    names = [f"t{k}" for k in range(len(byte_tables))]
+    return eval(f"lambda {', '.join(names)}: lambda b: "
+                f"{_byte_lookup_source(names, 'b', width)}")(*byte_tables)
+
+
+def _build_subkey_tables(pc1, pc2, shift_schedule):
+    """
+    Fold PC-1, the rotations and PC-2 into one selection table per round.
+
+    Round r's subkey is a fixed selection of 48 master-key bits, so the
+    whole key schedule can be written as sixteen 64-to-48-bit permutation
+    tables over the original key.
+
+    Args:
+        pc1 (tuple): Permutation Choice 1 table
+        pc2 (tuple): Permutation Choice 2 table
+        shift_schedule (tuple): Left rotation amount for each round
+
+    Returns:
+        list: Sixteen 48-entry tables of 1-based master-key bit positions
+    """
+    tables = []
+    shift = 0
+    for round_shift in shift_schedule:
+        shift += round_shift
+        table = []
+        for src in pc2:
+            # Position in C (0-27) or D (28-55) before any rotation
+            half, offset = divmod(src - 1, 28)
+            table.append(pc1[28 * half + (offset + shift) % 28])
+        tables.append(table)
+    return tables
+
+
+def _rotl56(cd, shift):
+    """
+    Rotate both 28-bit halves of a 56-bit C||D key value left by shift bits.
+
+    Bits leaving the top of C wrap to the bottom of C, and bits leaving the
+    top of D wrap to the bottom of D, all in one shift-and-mask expression.
+    """
+    low = (1 << shift) - 1
+    wrap = low | (low << 28)
+    return ((cd << shift) & (_M56 ^ wrap)) | ((cd >> (28 - shift)) & wrap)
+
+
+def _flatten_s_boxes(s_boxes):
+    """
+    Re-index each S-box by its raw 6-bit input.
+
+    In DES the first and last input bits select the row and the middle four
+    select the column. Doing that decoding once here turns every S-box
+    lookup into a single index.
+
+    Args:
+        s_boxes (tuple): The eight S-boxes (4 rows of 16 values each)
+
+    Returns:
+        tuple: Eight 64-entry tuples of 4-bit S-box outputs
+    """
+    flat = []
+    for s_box in s_boxes:
+        table = []
+        for v in range(64):
+            row = ((v >> 4) & 0x2) | (v & 0x1)
+            col = (v >> 1) & 0xF
+            table.append(s_box[row][col])
+        flat.append(tuple(table))
+    return tuple(flat)
+
+
+def _build_sp_tables(s_boxes, p_table):
+    """
+    Precompute combined S-box and permutation P lookup tables.
+
+    Entry [i][v] holds the 4-bit output of S-box i for the 6-bit input v,
+    already moved to the bit positions it occupies after permutation P.
+    Because P only moves bits, the round function output is the OR of the
+    eight entries selected by the eight 6-bit groups.
+
+    Args:
+        s_boxes (tuple): The eight flattened S-boxes from _flatten_s_boxes
+        p_table (tuple): Permutation P table
+
+    Returns:
+        tuple: Eight 64-entry tuples of 32-bit ints
+    """
+    permute_p = _compile_permutation(p_table, 32)
+    return tuple(tuple(permute_p(value << (28 - 4 * i)) for value in s_box)
+                 for i, s_box in enumerate(s_boxes))
+
+
+# _XOR_GATHER[k](table) returns the 64-entry tuple (table[v ^ k] for v = 0..63)
+_XOR_GATHER = tuple(itemgetter(*[v ^ k for v in range(64)]) for k in range(64))
+
+
+def _split_subkey(subkey):
+    """Split a 48-bit subkey into its eight 6-bit S-box input slices, S1 first."""
+    return tuple((subkey >> shift) & _M6 for shift in range(42, -6, -6))
+
+
+def _build_round_tables(sp, subkeys):
+    """
+    Fold each round's subkey into the combined S-box and P tables.
+
+    Entry [r][i][v] is sp[i][v ^ k], where k is the 6-bit slice of round
+    r's subkey that is XORed into S-box i's input. A round then needs no
+    key mixing step: each 6-bit group of the expanded half indexes its
+    table directly.
+
+    Args:
+        sp (tuple): Combined S-box and P tables from _build_sp_tables
+        subkeys (sequence): Sixteen 48-bit round keys, in application order
+
+    Returns:
+        tuple: For each round, eight 64-entry tuples of 32-bit ints
+    """
+    return tuple(tuple(_XOR_GATHER[k](table) for k, table in zip(_split_subkey(subkey), sp))
+                 for subkey in subkeys)
+
+
+def _build_block_function_factory():
+    """
+    Generate the factory that builds the per-key block functions.
+
+    The 16 rounds are unrolled into straight-line source, compiled once at
+    import. Each round reads its eight key-folded tables from
+    _build_round_tables through closure variables (s{round}_{sbox}), so a
+    block function built for a key has no loop and no indexing by round.
+    Rather than swapping the halves after each round, consecutive rounds
+    alternately update the left and the right half.
+
+    The expansion E is not computed: the 6-bit groups of E(R) are
+    consecutive, overlapping windows of R with its end bits wrapped around
+    (R32 R1 ... R32 R1), so each group is shifted and masked straight out
+    of that 34-bit value. IP and IP^-1 are inlined as lookups into their
+    byte tables, so encrypting a block makes no function calls.
+
+    Returns:
+        function: make(ip_tables, ip_inv_tables, round_tables) returning a
+        callable that maps a 64-bit input block to the output block
+    """
+    ip_names = [f"i{k}" for k in range(8)]
+    ip_inv_names = [f"f{k}" for k in range(8)]
+    lines = ["def make(ip_tables, ip_inv_tables, round_tables):",
+             f"    {', '.join(ip_names)} = ip_tables",
+             f"    {', '.join(ip_inv_names)} = ip_inv_tables"]
+    for r in range(16):
+        names = ", ".join(f"s{r}_{i}" for i in range(8))
+        lines.append(f"    ({names}), \\")
+    lines += ["        = round_tables",
+              "    def crypt_block(block):",
+              f"        block = {_byte_lookup_source(ip_names, 'block', 64)}",
+              "        left = block >> 32",
+              "        right = block & 0xFFFFFFFF"]
+    target, source = "left", "right"
+    for r in range(16):
+        lines += [f"        z = (({source} & 1) << 33) | ({source} << 1) | ({source} >> 31)",
+                  f"        {target} ^= (s{r}_0[z >> 28] | s{r}_1[(z >> 24) & 0x3F] |",
+                  f"                   s{r}_2[(z >> 20) & 0x3F] | s{r}_3[(z >> 16) & 0x3F] |",
+                  f"                   s{r}_4[(z >> 12) & 0x3F] | s{r}_5[(z >> 8) & 0x3F] |",
+                  f"                   s{r}_6[(z >> 4) & 0x3F] | s{r}_7[z & 0x3F])"]
+        target, source = source, target
+    # After 16 rounds "right" holds R16 and "left" holds L16; the final
+    # swap puts R16 first
+    lines += ["        block = (right << 32) | left",
+              f"        return {_byte_lookup_source(ip_inv_names, 'block', 64)}",
+              "    return crypt_block"]
+    
+    namespace = {}
+    exec(compile("\n".join(lines), "<des rounds>", "exec"), namespace)
+    return namespace["make"]
+
+
+_make_block_function = _build_block_function_factory()
+
+
+# Bulk messages of at least this many blocks are encrypted bitsliced; below
+# this the fixed cost of the transpose and S-box circuits outweighs the
+# per-block savings over the compiled scalar path
+_BITSLICE_MIN_BLOCKS = 96
+
+# _BIT_TABLES[b] maps every byte value to its bit b, for use with bytes.translate
+_BIT_TABLES = [bytes((v >> b) & 1 for v in range(256)) for b in range(8)]
+
+
+def _lane_masks(n):
+    """
+    Build the masks used to gather and scatter bit planes of n blocks.
+
+    Each mask is an 8n-bit int repeating one pattern: the low bit of every
+    byte, the low 2 bits of every 16, the low 4 bits of every 32 and the
+    low 8 bits of every 64.
+    """
+    return (int.from_bytes(b'\x01' * n, 'big'),
+            int.from_bytes(b'\x00\x03' * (n // 2), 'big'),
+            int.from_bytes(b'\x00\x00\x00\x0f' * (n // 4), 'big'),
+            int.from_bytes((b'\x00' * 7 + b'\xff') * (n // 8), 'big'))
+
+
+def _to_bit_planes(data, n, masks):
+    """
+    Transpose n 64-bit blocks (n a multiple of 8) into 64 n-bit planes.
+
+    Plane i holds bit i+1 (DES numbering, MSB first) of every block. Bit j
+    of a plane belongs to block n-1-j, the order int.from_bytes would give.
+    """
+    _, m2, m4, m8 = masks
+    planes = []
+    for p in range(8):
+        column = bytes(data[p::8])
+        for b in range(7, -1, -1):
+            # One byte lane per block holding the wanted bit, then squeeze
+            # the lanes together: 2, 4, then 8 bits per 64-bit word
+            x = int.from_bytes(column.translate(_BIT_TABLES[b]), 'big')
+            x = (x | (x >> 7)) & m2
+            x = (x | (x >> 14)) & m4
+            x = (x | (x >> 28)) & m8
+            planes.append(int.from_bytes(x.to_bytes(n, 'big')[7::8], 'big'))
+    return planes
+
+
+def _from_bit_planes(planes, n, masks):
+    """Inverse of _to_bit_planes: rebuild the 8n bytes of n blocks."""
+    m1, m2, m4, _ = masks
+    out = bytearray(8 * n)
+    spread = bytearray(n)
+    for p in range(8):
+        column = 0
+        for b in range(8):
+            # Spread the plane back out to one byte lane per block
+            spread[7::8] = planes[8 * p + b].to_bytes(n // 8, 'big')
+            x = int.from_bytes(spread, 'big')
+            x = (x | (x << 28)) & m4
+            x = (x | (x << 14)) & m2
+            x = (x | (x << 7)) & m1
+            column |= x << (7 - b)
+        out[p::8] = column.to_bytes(n, 'big')
+    return out
+
+
+def _build_s_box_truth_tables(s_boxes):
+    """
+    Express each S-box as four 64-entry truth tables, one per output bit.
+
+    Args:
+        s_boxes (tuple): The eight flattened S-boxes from _flatten_s_boxes
+
+    Returns:
+        tuple: For each S-box, four tuples (output MSB first) indexed by the
+        6-bit S-box input
+    """
+    return tuple(tuple(tuple((value >> t) & 1 for value in s_box) for t in range(3, -1, -1))
+                 for s_box in s_boxes)
+
+
+def _compile_s_box_circuit(truth_tables):
+    """
+    Compile one S-box into a straight-line function on bit planes.
+
+    Each truth table is split on one input bit at a time (the S-box input
+    MSB first) until it becomes constant, giving a multiplexer tree.
+    Sub-tables shared between output bits become one shared gate, and
+    nodes with a constant or complementary branch reduce to a single AND,
+    OR or XOR. The resulting gate list is emitted as source and compiled
+    once, so evaluating the S-box is a fixed sequence of bitwise operations.
+
+    Args:
+        truth_tables (tuple): Four truth tables from _build_s_box_truth_tables
+
+    Returns:
+        function: f(x0, ..., x5, ones) mapping six input planes (MSB first)
+        to a tuple of four output planes (MSB first); ones is the plane
+        with every lane set
+    """
+    lines = []
+    gates = {}
+    negated = set()
+    
+    def gate(expr):
+        name = f"g{len(lines)}"
+        lines.append(f"    {name} = {expr}")
+        return name
+    
+    def inverse(depth):
+        if depth not in negated:
+            negated.add(depth)
+            lines.append(f"    n{depth} = x{depth} ^ ones")
+        return f"n{depth}"
+    
+    def build(truth, depth):
+        if truth in gates:
+            return gates[truth]
+        if not any(truth):
+            result = "0"
+        elif all(truth):
+            result = "ones"
+        else:
+            half = len(truth) // 2
+            low_truth, high_truth = truth[:half], truth[half:]
+            low = build(low_truth, depth + 1)
+            high = build(high_truth, depth + 1)
+            x = f"x{depth}"
+            if low == high:
+                result = low
+            elif low == "0":
+                result = x if high == "ones" else gate(f"{high} & {x}")
+            elif high == "0":
+                result = inverse(depth) if low == "ones" else gate(f"{low} & {inverse(depth)}")
+            elif low == "ones":
+                result = gate(f"{high} | {inverse(depth)}")
+            elif high == "ones":
+                result = gate(f"{low} | {x}")
+            elif all(a != b for a, b in zip(low_truth, high_truth)):
+                result = gate(f"{low} ^ {x}")
+            else:
+                result = gate(f"{low} ^ (({low} ^ {high}) & {x})")
+        gates[truth] = result
+        return result
+    
+    outputs = [build(truth, 0) for truth in truth_tables]
+    source = "\n".join(["def s_box(x0, x1, x2, x3, x4, x5, ones):"] + lines +
+                        [f"    return {', '.join(outputs)}"])
+    namespace = {}
+    exec(compile(source, "<des s-box circuit>", "exec"), namespace)
+    return namespace["s_box"]
+
+
+def _des_bitsliced(data, subkeys, ip, ip_inv, e, p, s_circuits):
+    """
+    Run DES over every 8-byte block of data at once, bitsliced.
+
+    The blocks are transposed into 64 bit planes so each plane is one
+    Python int with a bit per block. Every permutation then just reorders
+    planes, and each S-box is a fixed sequence of AND/XOR operations that
+    processes all blocks together.
+
+    Args:
+        data (bytes): Input, a multiple of 8 bytes
+        subkeys (sequence): Sixteen 48-bit round keys, in application order
+        ip, ip_inv, e, p (tuple): DES permutation tables
+        s_circuits (tuple): Compiled S-boxes from _compile_s_box_circuit
+
+    Returns:
+        bytearray: Output blocks, same length as data
+    """
+    size = len(data)
+    n = -(-size // 64) * 8  # block count rounded up to a multiple of 8
+    if n * 8 != size:
+        padded = bytearray(n * 8)
+        padded[:size] = data
+        data = padded
+    masks = _lane_masks(n)
+    ones = (1 << n) - 1
+    
+    planes = _to_bit_planes(data, n, masks)
+    block = [planes[src - 1] for src in ip]
+    left = block[:32]
+    right = block[32:]
+    
+    for subkey in subkeys:
+        # Expansion and key mixing: a set key bit inverts its plane
+        xored = [right[src - 1] ^ ones if (subkey >> (47 - j)) & 1 else right[src - 1]
+                 for j, src in enumerate(e)]
+        substituted = []
+        for i in range(8):
+            substituted.extend(s_circuits[i](*xored[6*i:6*i+6], ones))
+        left, right = right, [left[j] ^ substituted[src - 1] for j, src in enumerate(p)]
+    
+    final = right + left
+    out = _from_bit_planes([final[src - 1] for src in ip_inv], n, masks)
+    del out[size:]
+    return out
+
+
+def _strip_padding(plaintext):
+    """
+    Remove the padding added by DES.encrypt from decrypted data.
+    
+    Args:
+        plaintext (memoryview): Decrypted data
+        
+    Returns:
+        memoryview: plaintext without its padding bytes
+    """
+    padding_length = plaintext[-1]
+    tail = plaintext[-padding_length:]
+    if padding_length < 8 and bytes(tail).count(padding_length) == len(tail):
+        return plaintext[:-padding_length]
+    return plaintext
+
+
+def _format_bits(value, width):
+    """Format an integer as a zero-padded binary string of the given width."""
+    return format(value, f"0{width}b")
+
 class DES:
+    """
+    DES block cipher for a single key.
+    
+    The whole key schedule (subkeys and the per-round lookup tables built
+    from them) is computed once, in __init__, and never recomputed by
+    encrypt or decrypt. Build one instance per key and reuse it for every
+    message; get_des caches instances for callers that only have the key.
+    """
+
     # Initial Permutation table
-    IP = [58, 50, 42, 34, 26, 18, 10, 2,
+    IP = (58, 50, 42, 34, 26, 18, 10, 2,
           60, 52, 44, 36, 28, 20, 12, 4,
           62, 54, 46, 38, 30, 22, 14, 6,
           64, 56, 48, 40, 32, 24, 16, 8,
           57, 49, 41, 33, 25, 17, 9, 1,
           59, 51, 43, 35, 27, 19, 11, 3,
           61, 53, 45, 37, 29, 21, 13, 5,
-          63, 55, 47, 39, 31, 23, 15, 7]
+          63, 55, 47, 39, 31, 23, 15, 7)
 
     # Inverse Initial Permutation table
-    IP_INV = [40, 8, 48, 16, 56, 24, 64, 32,
+    IP_INV = (40, 8, 48, 16, 56, 24, 64, 32,
               39, 7, 47, 15, 55, 23, 63, 31,
               38, 6, 46, 14, 54, 22, 62, 30,
               37, 5, 45, 13, 53, 21, 61, 29,
               36, 4, 44, 12, 52, 20, 60, 28,
               35, 3, 43, 11, 51, 19, 59, 27,
               34, 2, 42, 10, 50, 18, 58, 26,
-              33, 1, 41, 9, 49, 17, 57, 25]
+              33, 1, 41, 9, 49, 17, 57, 25)
 
     # Expansion table
-    E = [32, 1, 2, 3, 4, 5,
+    E = (32, 1, 2, 3, 4, 5,
          4, 5, 6, 7, 8, 9,
          8, 9, 10, 11, 12, 13,
          12, 13, 14, 15, 16, 17,
          16, 17, 18, 19, 20, 21,
          20, 21, 22, 23, 24, 25,
          24, 25, 26, 27, 28, 29,
-         28, 29, 30, 31, 32, 1]
+         28, 29, 30, 31, 32, 1)
 
     # Permutation Choice 1 table
-    PC1 = [57, 49, 41, 33, 25, 17, 9,
+    PC1 = (57, 49, 41, 33, 25, 17, 9,
            1, 58, 50, 42, 34, 26, 18,
            10, 2, 59, 51, 43, 35, 27,
            19, 11, 3, 60, 52, 44, 36,
            63, 55, 47, 39, 31, 23, 15,
            7, 62, 54, 46, 38, 30, 22,
            14, 6, 61, 53, 45, 37, 29,
-           21, 13, 5, 28, 20, 12, 4]
+           21, 13, 5, 28, 20, 12, 4)
 
     # Permutation Choice 2 table
-    PC2 = [14, 17, 11, 24, 1, 5,
+    PC2 = (14, 17, 11, 24, 1, 5,
            3, 28, 15, 6, 21, 10,
            23, 19, 12, 4, 26, 8,
            16, 7, 27, 20, 13, 2,
            41, 52, 31, 37, 47, 55,
            30, 40, 51, 45, 33, 48,
            44, 49, 39, 56, 34, 53,
-           46, 42, 50, 36, 29, 32]
+           46, 42, 50, 36, 29, 32)
 
     # Left circular shift schedule
-    SHIFT_SCHEDULE = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+    SHIFT_SCHEDULE = (1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1)
 
     # S-Boxes
-    S_BOXES = [
+    S_BOXES = (
         # S1
-        [
-            [14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7],
-            [0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8],
-            [4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0],
-            [15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13]
-        ],
+        (
+            (14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7),
+            (0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8),
+            (4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0),
+            (15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13)
+        ),
         # S2
-        [
-            [15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10],
-            [3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5],
-            [0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15],
-            [13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9]
-        ],
+        (
+            (15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10),
+            (3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5),
+            (0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15),
+            (13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9)
+        ),
         # S3
-        [
-            [10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8],
-            [13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1],
-            [13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7],
-            [1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12]
-        ],
+        (
+            (10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8),
+            (13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1),
+            (13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7),
+            (1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12)
+        ),
         # S4
-        [
-            [7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15],
-            [13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9],
-            [10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4],
-            [3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14]
-        ],
+        (
+            (7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15),
+            (13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9),
+            (10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4),
+            (3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14)
+        ),
         # S5
-        [
-            [2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9],
-            [14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6],
-            [4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14],
-            [11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3]
-        ],
+        (
+            (2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9),
+            (14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6),
+            (4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14),
+            (11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3)
+        ),
         # S6
-        [
-            [12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11],
-            [10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8],
-            [9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6],
-            [4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13]
-        ],
+        (
+            (12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11),
+            (10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8),
+            (9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6),
+            (4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13)
+        ),
         # S7
-        [
-            [4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1],
-            [13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6],
-            [1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2],
-            [6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12]
-        ],
+        (
+            (4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1),
+            (13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6),
+            (1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2),
+            (6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12)
+        ),
         # S8
-        [
-            [13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7],
-            [1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2],
-            [7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8],
-            [2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11]
-        ]
-    ]
+        (
+            (13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7),
+            (1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2),
+            (7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8),
+            (2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11)
+        )
+    )
 
     # Permutation P table
-    P = [16, 7, 20, 21,
+    P = (16, 7, 20, 21,
          29, 12, 28, 17,
          1, 15, 23, 26,
          5, 18, 31, 10,
          2, 8, 24, 14,
          32, 27, 3, 9,
          19, 13, 30, 6,
-         22, 11, 4, 25]
+         22, 11, 4, 25)
+
+    # Compiled permutation functions (int -> int), built once per class
+    _ip = staticmethod(_compile_byte_permutation(IP, 64))
+    _ip_inv = staticmethod(_compile_byte_permutation(IP_INV, 64))
+    _e = staticmethod(_compile_byte_permutation(E, 32))
+    _pc1 = staticmethod(_compile_byte_permutation(PC1, 64))
+    _pc2 = staticmethod(_compile_byte_permutation(PC2, 56))
+    _p = staticmethod(_compile_byte_permutation(P, 32))
+
+    # Per-input-byte tables of IP and IP^-1, inlined into the compiled rounds
+    _IP_BYTES = _build_byte_tables(IP, 64)
+    _IP_INV_BYTES = _build_byte_tables(IP_INV, 64)
+
+    # One compiled master key -> round key selection per round
+    _subkey_selectors = tuple(_compile_permutation(table, 64) for table in
+                              _build_subkey_tables(PC1, PC2, SHIFT_SCHEDULE))
+
+    # S-boxes indexed directly by their 6-bit input
+    _S_FLAT = _flatten_s_boxes(S_BOXES)
+
+    # Combined S-box + P lookup tables, indexed by S-box then 6-bit input
+    _SP = _build_sp_tables(_S_FLAT, P)
+
+    # Compiled S-box circuits for the bitsliced bulk path
+    _S_CIRCUITS = tuple(_compile_s_box_circuit(truth_tables)
+                        for truth_tables in _build_s_box_truth_tables(_S_FLAT))
+
+    def __new__(cls, key, debug=False):
+        """Create a DES cipher, using the tracing implementation in debug mode."""
+        if debug and cls is DES:
+            cls = _DESDebug
+        return super().__new__(cls)
 
     def __init__(self, key, debug=False):
         """
@@ -139,208 +680,157 @@ class DES:
         
         Args:
             key (bytes): 8-byte key (64 bits, but only 56 bits are used)
-            debug (bool): If True, print debug information during operations
+            debug (bool): If True, log every intermediate value at DEBUG level
         """
         if len(key) != 8:
             raise ValueError("Key must be 8 bytes (64 bits)")
         
-        self.key = self._bytes_to_bit_array(key)
+        self.key = _U64.unpack(key)[0]
         self.debug = debug
         self.subkeys = self._generate_subkeys()
-        
-        if self.debug:
-            print("Initial key (64 bits):", self.key)
-            for i, subkey in enumerate(self.subkeys):
-                print(f"Round key {i+1} (48 bits):", subkey)
-
-    def _bytes_to_bit_array(self, data):
-        """Convert bytes to a bit array."""
-        result = []
-        for byte in data:
-            for i in range(7, -1, -1):  # MSB first
-                result.append((byte >> i) & 1)
-        return result
+        self._decrypt_subkeys = self.subkeys[::-1]
+        # Decryption uses the same per-round tables in reverse order
+        round_tables = _build_round_tables(self._SP, self.subkeys)
+        self._encrypt_function = _make_block_function(
+            self._IP_BYTES, self._IP_INV_BYTES, round_tables)
+        self._decrypt_function = _make_block_function(
+            self._IP_BYTES, self._IP_INV_BYTES, round_tables[::-1])
 
-    def _bit_array_to_bytes(self, bits):
-        """Convert a bit array to bytes."""
-        result = bytearray()
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(8):
-                byte = (byte << 1) | bits[i + j]
-            result.append(byte)
-        return bytes(result)
+    def _trace(self, label, value, width=None):
+        """
+        Report an intermediate value. Does nothing outside debug mode.
+        
+        Args:
+            label (str): Name of the value
+            value (int or str): Value to report
+            width (int, optional): Bit width to format an int value with
+        """
 
-    def _permute(self, block, table):
-        """Permute the block using the given table."""
-        return [block[table[i] - 1] for i in range(len(table))]
+    def _trace_s_box(self, index, group, value):
+        """
+        Report one S-box lookup. Does nothing outside debug mode.
+        
+        The raw ints are passed so that nothing is formatted unless the
+        lookup is actually logged.
+        
+        Args:
+            index (int): S-box number, from 0
+            group (int): 6-bit S-box input
+            value (int): 4-bit S-box output
+        """
 
     def _initial_permutation(self, block):
         """Apply initial permutation to the 64-bit block."""
-        if self.debug:
-            print("Before IP:", block)
-        result = self._permute(block, self.IP)
-        if self.debug:
-            print("After IP:", result)
+        self._trace("Before IP", block, 64)
+        result = self._ip(block)
+        self._trace("After IP", result, 64)
         return result
 
     def _inverse_initial_permutation(self, block):
         """Apply inverse initial permutation to the 64-bit block."""
-        if self.debug:
-            print("Before IP^-1:", block)
-        result = self._permute(block, self.IP_INV)
-        if self.debug:
-            print("After IP^-1:", result)
+        self._trace("Before IP^-1", block, 64)
+        result = self._ip_inv(block)
+        self._trace("After IP^-1", result, 64)
         return result
 
     def _expansion(self, block):
         """Expand 32-bit block to 48 bits using E-box."""
-        if self.debug:
-            print("Before E:", block)
-        result = self._permute(block, self.E)
-        if self.debug:
-            print("After E:", result)
+        self._trace("Before E", block, 32)
+        result = self._e(block)
+        self._trace("After E", result, 48)
         return result
 
     def _permuted_choice_1(self, key):
         """Apply PC-1 permutation to 64-bit key to get 56-bit key."""
-        if self.debug:
-            print("Before PC-1:", key)
-        result = self._permute(key, self.PC1)
-        if self.debug:
-            print("After PC-1:", result)
+        self._trace("Before PC-1", key, 64)
+        result = self._pc1(key)
+        self._trace("After PC-1", result, 56)
         return result
 
     def _permuted_choice_2(self, key):
         """Apply PC-2 permutation to 56-bit key to get 48-bit subkey."""
-        if self.debug:
-            print("Before PC-2:", key)
-        result = self._permute(key, self.PC2)
-        if self.debug:
-            print("After PC-2:", result)
+        self._trace("Before PC-2", key, 56)
+        result = self._pc2(key)
+        self._trace("After PC-2", result, 48)
         return result
 
-    def _left_circular_shift(self, bits, shift):
-        """Apply left circular shift to a bit array."""
-        return bits[shift:] + bits[:shift]
-
     def _generate_subkeys(self):
-        """Generate 16 48-bit subkeys from the 64-bit master key."""
-        # Apply PC-1
-        key_56 = self._permuted_choice_1(self.key)
-        
-        # Split into left and right halves (28 bits each)
-        c = key_56[:28]
-        d = key_56[28:]
-        
-        # Generate 16 subkeys
-        subkeys = []
-        for i in range(16):
-            # Apply shift schedule
-            shift = self.SHIFT_SCHEDULE[i]
-            c = self._left_circular_shift(c, shift)
-            d = self._left_circular_shift(d, shift)
-            
-            # Combine C and D
-            cd = c + d
-            
-            # Apply PC-2
-            subkey = self._permuted_choice_2(cd)
-            subkeys.append(subkey)
-            
-            if self.debug:
-                print(f"Round {i+1} C:", c)
-                print(f"Round {i+1} D:", d)
+        """
+        Generate 16 48-bit subkeys from the 64-bit master key.
         
-        return subkeys
-
-    def _xor(self, a, b):
-        """Bitwise XOR of two bit arrays."""
-        return [a[i] ^ b[i] for i in range(len(a))]
+        Returns:
+            tuple: Sixteen 48-bit ints, one per round
+        """
+        return tuple(select(self.key) for select in self._subkey_selectors)
 
     def _s_box_substitution(self, block):
         """
         Apply S-box substitution to transform 48-bit block to 32-bit block.
         
         Args:
-            block (list): 48-bit block
+            block (int): 48-bit block
             
         Returns:
-            list: 32-bit block after S-box substitution
+            int: 32-bit block after S-box substitution
         """
-        if self.debug:
-            print("Before S-boxes:", block)
-            
-        # Split block into 8 groups of 6 bits each
-        groups = [block[i:i+6] for i in range(0, 48, 6)]
+        self._trace("Before S-boxes", block, 48)
         
-        result = []
-        for i, group in enumerate(groups):
-            # First and last bit determine row (0-3)
-            row = (group[0] << 1) | group[5]
+        result = 0
+        for i in range(8):
+            # Take the i-th group of 6 bits, starting from the MSB
+            group = (block >> (42 - 6 * i)) & _M6
             
-            # Middle 4 bits determine column (0-15)
-            col = (group[1] << 3) | (group[2] << 2) | (group[3] << 1) | group[4]
-            
-            # Get value from S-box (0-15)
-            value = self.S_BOXES[i][row][col]
-            
-            # Convert to 4 bits
-            for j in range(3, -1, -1):
-                result.append((value >> j) & 1)
-                
-            if self.debug:
-                print(f"S-box {i+1}: input={group}, row={row}, col={col}, output={value:04b}")
-        
-        if self.debug:
-            print("After S-boxes:", result)
+            # Get value from S-box (0-15) and append its 4 bits. The flat
+            # table already folds in the row (first and last bit) and column
+            # (middle 4 bits) selection.
+            value = self._S_FLAT[i][group]
+            result = (result << 4) | value
             
+            self._trace_s_box(i, group, value)
+        
+        self._trace("After S-boxes", result, 32)
         return result
 
     def _permutation_p(self, block):
         """Apply permutation P to 32-bit block after S-box substitution."""
-        if self.debug:
-            print("Before P:", block)
-        result = self._permute(block, self.P)
-        if self.debug:
-            print("After P:", result)
+        self._trace("Before P", block, 32)
+        result = self._p(block)
+        self._trace("After P", result, 32)
         return result
 
     def _f_function(self, r, subkey):
         """
         Apply Feistel function to right half and subkey.
         
+        S-box substitution and permutation P are done in one pass over the
+        combined SP tables.
+        
         Args:
-            r (list): 32-bit right half
-            subkey (list): 48-bit subkey
+            r (int): 32-bit right half
+            subkey (int): 48-bit subkey
             
         Returns:
-            list: 32-bit result
+            int: 32-bit result
         """
-        # Expansion: 32 bits -> 48 bits
-        expanded = self._expansion(r)
-        
-        # XOR with subkey
-        xored = self._xor(expanded, subkey)
-        if self.debug:
-            print("After XOR with round key:", xored)
-        
-        # S-box substitution: 48 bits -> 32 bits
-        substituted = self._s_box_substitution(xored)
-        
-        # Permutation P
-        permuted = self._permutation_p(substituted)
-        
-        return permuted
+        xored = self._e(r) ^ subkey
+        sp = self._SP
+        return (sp[0][xored >> 42] |
+                sp[1][(xored >> 36) & 0x3F] |
+                sp[2][(xored >> 30) & 0x3F] |
+                sp[3][(xored >> 24) & 0x3F] |
+                sp[4][(xored >> 18) & 0x3F] |
+                sp[5][(xored >> 12) & 0x3F] |
+                sp[6][(xored >> 6) & 0x3F] |
+                sp[7][xored & 0x3F])
 
     def _des_round(self, left, right, subkey):
         """
         Execute one round of DES.
         
         Args:
-            left (list): 32-bit left half
-            right (list): 32-bit right half
-            subkey (list): 48-bit subkey
+            left (int): 32-bit left half
+            right (int): 32-bit right half
+            subkey (int): 48-bit subkey
             
         Returns:
             tuple: (new left half, new right half)
@@ -349,9 +839,8 @@ class DES:
         f_result = self._f_function(right, subkey)
         
         # XOR left half with f_result
-        new_right = self._xor(left, f_result)
-        if self.debug:
-            print("After XOR with left half:", new_right)
+        new_right = left ^ f_result
+        self._trace("After XOR with left half", new_right, 32)
         
         # New left half is the old right half
         new_left = right
@@ -364,99 +853,77 @@ class DES:
         Encrypt a 64-bit block using DES.
         
         Args:
-            plaintext_block (list): 64-bit block to encrypt
+            plaintext_block (int): 64-bit block to encrypt
             
         Returns:
-            list: 64-bit encrypted block
+            int: 64-bit encrypted block
         """
-        # Initial permutation
-        block = self._initial_permutation(plaintext_block)
-        
-        # Split into left and right halves
-        left = block[:32]
-        right = block[32:]
-        
-        if self.debug:
-            print("Initial L:", left)
-            print("Initial R:", right)
-        
-        # 16 rounds
-        for i in range(16):
-            if self.debug:
-                print(f"\n--- Round {i+1} ---")
-            
-            # Apply round
-            left, right = self._des_round(left, right, self.subkeys[i])
-            
-            if self.debug:
-                print(f"L{i+1}:", left)
-                print(f"R{i+1}:", right)
-        
-        # Swap final left and right halves
-        if self.debug:
-            print("\n--- Final swap ---")
-            print("Before swap - L16:", left)
-            print("Before swap - R16:", right)
-        
-        # Note: In DES, there's a final swap of L16 and R16
-        final_block = right + left
-        
-        if self.debug:
-            print("After swap:", final_block)
-        
-        # Inverse initial permutation
-        ciphertext_block = self._inverse_initial_permutation(final_block)
-        
-        return ciphertext_block
+        return self._encrypt_function(plaintext_block)
 
     def decrypt_block(self, ciphertext_block):
         """
         Decrypt a 64-bit block using DES.
         
         Args:
-            ciphertext_block (list): 64-bit block to decrypt
+            ciphertext_block (int): 64-bit block to decrypt
             
         Returns:
-            list: 64-bit decrypted block
+            int: 64-bit decrypted block
         """
-        # Initial permutation
-        block = self._initial_permutation(ciphertext_block)
-        
-        # Split into left and right halves
-        left = block[:32]
-        right = block[32:]
-        
-        if self.debug:
-            print("Initial L:", left)
-            print("Initial R:", right)
+        return self._decrypt_function(ciphertext_block)
+
+    def _crypt(self, data, subkeys, crypt_block):
+        """
+        Run DES over every 8-byte block of data.
         
-        # 16 rounds with reversed subkeys
-        for i in range(16):
-            if self.debug:
-                print(f"\n--- Round {i+1} ---")
-            
-            # Apply round with reversed subkey order
-            left, right = self._des_round(left, right, self.subkeys[15-i])
+        Args:
+            data (bytes): Input, a multiple of 8 bytes
+            subkeys (sequence): Round keys in application order
+            crypt_block (function): Compiled block function for these subkeys
             
-            if self.debug:
-                print(f"L{i+1}:", left)
-                print(f"R{i+1}:", right)
-        
-        # Swap final left and right halves
-        if self.debug:
-            print("\n--- Final swap ---")
-            print("Before swap - L16:", left)
-            print("Before swap - R16:", right)
+        Returns:
+            bytes-like: Output blocks
+        """
+        if len(data) >= _BITSLICE_MIN_BLOCKS * 8:
+            # Large messages: process all blocks at once, bitsliced
+            return _des_bitsliced(data, subkeys, self.IP, self.IP_INV,
+                                  self.E, self.P, self._S_CIRCUITS)
         
-        final_block = right + left
+        # Convert the whole buffer to and from big-endian 64-bit ints in
+        # one call each, rather than slicing block by block
+        layout = struct.Struct(f">{len(data) // 8}Q")
+        return layout.pack(*map(crypt_block, layout.unpack(data)))
+
+    def _crypt_into(self, data, out, offset, subkeys, crypt_block):
+        """
+        Run DES over every 8-byte block of data, writing the result into out.
         
-        if self.debug:
-            print("After swap:", final_block)
+        Args:
+            data (bytes-like): Input, a multiple of 8 bytes
+            out (writable bytes-like): Output buffer
+            offset (int): Position in out of the first output byte
+            subkeys (sequence): Round keys in application order
+            crypt_block (function): Compiled block function for these subkeys
+        """
+        if len(data) >= _BITSLICE_MIN_BLOCKS * 8:
+            out[offset:offset + len(data)] = self._crypt(data, subkeys, crypt_block)
+            return
         
-        # Inverse initial permutation
-        plaintext_block = self._inverse_initial_permutation(final_block)
+        layout = struct.Struct(f">{len(data) // 8}Q")
+        layout.pack_into(out, offset, *map(crypt_block, layout.unpack(data)))
+
+    @staticmethod
+    def encrypted_length(length):
+        """
+        Return the ciphertext size for a plaintext of the given length.
         
-        return plaintext_block
+        Args:
+            length (int): Plaintext length in bytes
+            
+        Returns:
+            int: Length rounded up to a whole number of 8-byte blocks
+        """
+        return -(-length // 8) * 8
 
     def encrypt(self, plaintext):
         """
@@ -473,16 +940,7 @@ class DES:
         if padding_length < 8:
             plaintext += bytes([padding_length]) * padding_length
         
-        # Process each 8-byte block
-        ciphertext = bytearray()
-        for i in range(0, len(plaintext), 8):
-            block = plaintext[i:i+8]
-            bit_block = self._bytes_to_bit_array(block)
-            encrypted_bit_block = self.encrypt_block(bit_block)
-            encrypted_block = self._bit_array_to_bytes(encrypted_bit_block)
-            ciphertext.extend(encrypted_block)
-        
-        return bytes(ciphertext)
+        return bytes(self._crypt(plaintext, self.subkeys, self._encrypt_function))
 
     def decrypt(self, ciphertext):
         """
@@ -497,18 +955,223 @@ class DES:
         if len(ciphertext) % 8 != 0:
             raise ValueError("Ciphertext length must be a multiple of 8 bytes")
         
-        # Process each 8-byte block
-        plaintext = bytearray()
-        for i in range(0, len(ciphertext), 8):
-            block = ciphertext[i:i+8]
-            bit_block = self._bytes_to_bit_array(block)
-            decrypted_bit_block = self.decrypt_block(bit_block)
-            decrypted_block = self._bit_array_to_bytes(decrypted_bit_block)
-            plaintext.extend(decrypted_block)
-        
-        # Remove padding
-        padding_length = plaintext[-1]
-        if padding_length < 8 and all(b == padding_length for b in plaintext[-padding_length:]):
-            plaintext = plaintext[:-padding_length]
-        
-        return bytes(plaintext)
+        plaintext = self._crypt(ciphertext, self._decrypt_subkeys, self._decrypt_function)
+        
+        # Remove padding, copying the output only once
+        return bytes(_strip_padding(memoryview(plaintext)))
+
+    def encrypt_into(self, plaintext, out):
+        """
+        Encrypt plaintext straight into a caller-provided buffer.
+        
+        Produces the same bytes as encrypt() without allocating the
+        ciphertext, so callers can reuse one buffer across messages.
+        
+        Args:
+            plaintext (bytes-like): Data to encrypt (will be padded to 8-byte blocks)
+            out (writable bytes-like): Buffer of at least
+                encrypted_length(len(plaintext)) bytes
+            
+        Returns:
+            int: Number of bytes written to out
+        """
+        size = self.encrypted_length(len(plaintext))
+        if len(out) < size:
+            raise ValueError("Output buffer is too small for the ciphertext")
+        
+        # Full blocks are read in place; only a short final block is copied
+        # to be padded
+        full = len(plaintext) - len(plaintext) % 8
+        with memoryview(plaintext) as data:
+            self._crypt_into(data[:full], out, 0, self.subkeys, self._encrypt_function)
+            if full < size:
+                padding_length = size - len(plaintext)
+                last = bytes(data[full:]) + bytes([padding_length]) * padding_length
+                self._crypt_into(last, out, full, self.subkeys, self._encrypt_function)
+        
+        return size
+
+    def decrypt_into(self, ciphertext, out):
+        """
+        Decrypt ciphertext straight into a caller-provided buffer.
+        
+        out may be the buffer holding ciphertext, to decrypt in place.
+        
+        Args:
+            ciphertext (bytes-like): Data to decrypt (must be multiple of 8 bytes)
+            out (writable bytes-like): Buffer of at least len(ciphertext) bytes
+            
+        Returns:
+            int: Length of the plaintext at the start of out, padding removed
+        """
+        size = len(ciphertext)
+        if size % 8 != 0:
+            raise ValueError("Ciphertext length must be a multiple of 8 bytes")
+        if len(out) < size:
+            raise ValueError("Output buffer is too small for the plaintext")
+        
+        self._crypt_into(ciphertext, out, 0, self._decrypt_subkeys, self._decrypt_function)
+        
+        with memoryview(out) as view:
+            return len(_strip_padding(view[:size]))
+
+
+class _DESDebug(DES):
+    """
+    DES variant used when debug=True.
+    
+    Runs every block through the individual steps of the algorithm and
+    logs each intermediate value, instead of the fused fast paths.
+    """
+
+    def __init__(self, key, debug=True):
+        """Initialize the cipher, then log the key and every round key."""
+        super().__init__(key, debug)
+        
+        self._trace("Initial key (64 bits)", self.key, 64)
+        for i, subkey in enumerate(self.subkeys):
+            self._trace(f"Round key {i+1} (48 bits)", subkey, 48)
+
+    def _trace(self, label, value, width=None):
+        """Log an intermediate value, as a bit string if a width is given."""
+        if not _log.isEnabledFor(logging.DEBUG):
+            return
+        if width is not None:
+            value = _format_bits(value, width)
+        _log.debug("%s: %s", label, value)
+
+    def _trace_s_box(self, index, group, value):
+        """Log one S-box lookup with its row and column."""
+        if not _log.isEnabledFor(logging.DEBUG):
+            return
+        _log.debug("S-box %d: input=%s, row=%d, col=%d, output=%s", index + 1,
+                   _format_bits(group, 6), ((group >> 4) & 0x2) | (group & 0x1),
+                   (group >> 1) & 0xF, _format_bits(value, 4))
+
+    def _generate_subkeys(self):
+        """
+        Generate 16 48-bit subkeys step by step (PC-1, shifts, PC-2).
+        
+        Returns:
+            tuple: Sixteen 48-bit ints, one per round
+        """
+        # Apply PC-1. C is the upper and D the lower 28 bits of the result.
+        cd = self._permuted_choice_1(self.key)
+        
+        # Generate 16 subkeys
+        subkeys = []
+        for i in range(16):
+            # Apply shift schedule to C and D together
+            cd = _rotl56(cd, self.SHIFT_SCHEDULE[i])
+            
+            # Apply PC-2
+            subkey = self._permuted_choice_2(cd)
+            subkeys.append(subkey)
+            
+            self._trace(f"Round {i+1} C", cd >> 28, 28)
+            self._trace(f"Round {i+1} D", cd & _M28, 28)
+        
+        return tuple(subkeys)
+
+    def _f_function(self, r, subkey):
+        """
+        Apply Feistel function to right half and subkey, step by step.
+        
+        Args:
+            r (int): 32-bit right half
+            subkey (int): 48-bit subkey
+            
+        Returns:
+            int: 32-bit result
+        """
+        # Expansion: 32 bits -> 48 bits
+        expanded = self._expansion(r)
+        
+        # XOR with subkey
+        xored = expanded ^ subkey
+        self._trace("After XOR with round key", xored, 48)
+        
+        # S-box substitution: 48 bits -> 32 bits
+        substituted = self._s_box_substitution(xored)
+        
+        # Permutation P
+        permuted = self._permutation_p(substituted)
+        
+        return permuted
+
+    def _crypt_block(self, block, subkeys):
+        """
+        Run the 16 DES rounds over a 64-bit block, tracing every step.
+        
+        Args:
+            block (int): 64-bit input block
+            subkeys (sequence): Round keys in application order
+            
+        Returns:
+            int: 64-bit output block
+        """
+        # Initial permutation
+        block = self._initial_permutation(block)
+        
+        # Split into left and right halves
+        left = block >> 32
+        right = block & _M32
+        
+        self._trace("Initial L", left, 32)
+        self._trace("Initial R", right, 32)
+        
+        # 16 rounds
+        for i, subkey in enumerate(subkeys):
+            _log.debug("\n--- Round %d ---", i + 1)
+            
+            # Apply round
+            left, right = self._des_round(left, right, subkey)
+            
+            self._trace(f"L{i+1}", left, 32)
+            self._trace(f"R{i+1}", right, 32)
+        
+        # Swap final left and right halves
+        _log.debug("\n--- Final swap ---")
+        self._trace("Before swap - L16", left, 32)
+        self._trace("Before swap - R16", right, 32)
+        
+        # Note: In DES, there's a final swap of L16 and R16
+        final_block = (right << 32) | left
+        
+        self._trace("After swap", final_block, 64)
+        
+        # Inverse initial permutation
+        return self._inverse_initial_permutation(final_block)
+
+    def encrypt_block(self, plaintext_block):
+        """Encrypt a 64-bit block, tracing every step."""
+        return self._crypt_block(plaintext_block, self.subkeys)
+
+    def decrypt_block(self, ciphertext_block):
+        """Decrypt a 64-bit block, tracing every step (subkeys reversed)."""
+        return self._crypt_block(ciphertext_block, self._decrypt_subkeys)
+
+    def _crypt(self, data, subkeys, crypt_block):
+        """Run DES over every 8-byte block of data, one traced block at a time."""
+        layout = struct.Struct(f">{len(data) // 8}Q")
+        return layout.pack(*[self._crypt_block(block, subkeys)
+                             for block in layout.unpack(data)])
+
+    def _crypt_into(self, data, out, offset, subkeys, crypt_block):
+        """Run DES over every 8-byte block of data into out, tracing every block."""
+        out[offset:offset + len(data)] = self._crypt(data, subkeys, crypt_block)
+
+
+@lru_cache(maxsize=4)
+def get_des(key, debug=False):
+    """
+    Return a shared DES cipher for key, creating it on first use.
+    
+    Args:
+        key (bytes): 8-byte key
+        debug (bool): If True, return a cipher that logs debug information
+        
+    Returns:
+        DES: Cipher whose key schedule was computed when it was first requested
+    """
+    return DES(key, debug=debug)
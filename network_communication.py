@@ -5,17 +5,69 @@ This module provides the Sender and Receiver classes for network communication
 using DES encryption. Both classes can send and receive encrypted messages.
 """
 
+import logging
 import socket
-import pickle
-import os
-import sys
-import time
-from des import DES
+import struct
+from collections import deque
+from des import get_des
+
+# Debug output of message bytes, shown for communicators created with
+# debug=True when logging is configured at DEBUG
+_log = logging.getLogger(__name__)
+
+# Every message is framed by its ciphertext length as a big-endian uint32
+_LENGTH_PREFIX = struct.Struct('>I')
+
+class BufferPool:
+    """Reusable fixed-size byte buffers for framing and receiving messages."""
+    
+    def __init__(self, count=8, buffer_size=64 * 1024):
+        """
+        Initialize an empty buffer pool.
+        
+        Args:
+            count (int): Maximum number of idle buffers kept for reuse
+            buffer_size (int): Size of each pooled buffer in bytes
+        """
+        self.count = count
+        self.buffer_size = buffer_size
+        self._free = deque()
+    
+    def acquire(self, size):
+        """
+        Borrow a buffer of at least size bytes.
+        
+        Requests larger than buffer_size get a new buffer of exactly that
+        size, which is not kept by the pool.
+        
+        Args:
+            size (int): Minimum buffer size in bytes
+            
+        Returns:
+            bytearray: Buffer to hand back with release()
+        """
+        if size > self.buffer_size:
+            return bytearray(size)
+        if self._free:
+            return self._free.pop()
+        return bytearray(self.buffer_size)
+    
+    def release(self, buffer):
+        """
+        Return a buffer obtained from acquire().
+        
+        Args:
+            buffer (bytearray): Buffer to return
+        """
+        if len(buffer) == self.buffer_size and len(self._free) < self.count:
+            self._free.append(buffer)
+
 
 class DESCommunicator:
     """Base class for DES network communication."""
     
-    def __init__(self, key, host, port, debug=False):
+    def __init__(self, key, host, port, debug=False, nodelay=True, sndbuf=None, rcvbuf=None,
+                 buffer_pool=None):
         """
         Initialize the DES communicator.
         
@@ -24,11 +76,21 @@ class DESCommunicator:
             host (str): Host address to connect to or listen on
             port (int): Port to connect to or listen on
             debug (bool): Enable debug output
+            nodelay (bool): Disable Nagle's algorithm (TCP_NODELAY)
+            sndbuf (int, optional): Socket send buffer size in bytes
+            rcvbuf (int, optional): Socket receive buffer size in bytes
+            buffer_pool (BufferPool, optional): Pool of reusable message
+                buffers; a default-sized pool is created if not given
         """
-        self.des = DES(key, debug=debug)
+        self.des = get_des(bytes(key), debug)
         self.host = host
         self.port = port
         self.debug = debug
+        self.nodelay = nodelay
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
+        self.buffer_pool = buffer_pool if buffer_pool is not None else BufferPool()
+        self._header = bytearray(_LENGTH_PREFIX.size)
         self.socket = None
         self.connection = None
     
@@ -48,45 +110,60 @@ class DESCommunicator:
         message = input(prompt)
         return message.encode('utf-8')
     
-    def encrypt_message(self, message):
+    def encrypt_message(self, message, out=None):
         """
         Encrypt a message using DES.
         
         Args:
             message (bytes): Message to encrypt
+            out (writable bytes-like, optional): Buffer to encrypt into, of
+                at least des.encrypted_length(len(message)) bytes
             
         Returns:
-            bytes: Encrypted message
+            bytes: Encrypted message, or a memoryview of out holding it
         """
         print("Encrypting message...")
         if self.debug:
-            print(f"Original message (bytes): {message}")
+            _log.debug("Original message (bytes): %r", message)
         
-        encrypted = self.des.encrypt(message)
+        if out is None:
+            encrypted = self.des.encrypt(message)
+        else:
+            encrypted = memoryview(out)[:self.des.encrypt_into(message, out)]
         
         if self.debug:
-            print(f"Encrypted message (bytes): {encrypted}")
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Encrypted message (bytes): %r", bytes(encrypted))
         
         return encrypted
     
-    def decrypt_message(self, encrypted_message):
+    def decrypt_message(self, encrypted_message, out=None):
         """
         Decrypt a message using DES.
         
         Args:
             encrypted_message (bytes): Message to decrypt
+            out (writable bytes-like, optional): Buffer to decrypt into, of
+                at least len(encrypted_message) bytes; may be the buffer
+                holding encrypted_message
             
         Returns:
-            bytes: Decrypted message
+            bytes: Decrypted message, or a memoryview of out holding it
         """
         print("Decrypting message...")
         if self.debug:
-            print(f"Encrypted message (bytes): {encrypted_message}")
+            # Only copy a received buffer when it will actually be logged
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Encrypted message (bytes): %r", bytes(encrypted_message))
         
-        decrypted = self.des.decrypt(encrypted_message)
+        if out is None:
+            decrypted = self.des.decrypt(encrypted_message)
+        else:
+            decrypted = memoryview(out)[:self.des.decrypt_into(encrypted_message, out)]
         
         if self.debug:
-            print(f"Decrypted message (bytes): {decrypted}")
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Decrypted message (bytes): %r", bytes(decrypted))
         
         return decrypted
     
@@ -107,6 +184,94 @@ class DESCommunicator:
             print("Warning: Could not decode message as UTF-8.")
             print("Raw bytes:", message)
     
+    def _configure_socket(self, sock):
+        """
+        Apply the TCP options chosen for this communicator to a socket.
+        
+        Buffer sizes left as None keep the operating system's defaults,
+        which on most systems grow automatically with the connection.
+        
+        Args:
+            sock (socket.socket): Socket to configure
+        """
+        if self.nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.sndbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+    
+    def _send_frame(self, message):
+        """
+        Encrypt a message and send it preceded by its length.
+        
+        The frame is assembled in a buffer borrowed from the buffer pool,
+        with the ciphertext encrypted straight into it after the length, and
+        sent with a single sendall call, so a short message costs one send
+        and is not split across two TCP segments.
+        
+        Args:
+            message (bytes): Message to encrypt and send
+        """
+        encrypted_length = self.des.encrypted_length(len(message))
+        size = _LENGTH_PREFIX.size + encrypted_length
+        buffer = self.buffer_pool.acquire(size)
+        try:
+            _LENGTH_PREFIX.pack_into(buffer, 0, encrypted_length)
+            with memoryview(buffer) as view:
+                self.encrypt_message(message, view[_LENGTH_PREFIX.size:size])
+                self.connection.sendall(view[:size])
+        finally:
+            self.buffer_pool.release(buffer)
+    
+    def _receive_into(self, view):
+        """
+        Fill a writable buffer completely from the connection.
+        
+        Args:
+            view (memoryview): Buffer to fill
+            
+        Returns:
+            bool: True if filled, False if the connection closed first
+        """
+        size = len(view)
+        received = 0
+        
+        while received < size:
+            count = self.connection.recv_into(view[received:])
+            if not count:
+                return False
+            received += count
+        
+        return True
+    
+    def _receive_frame(self):
+        """
+        Receive one length-prefixed encrypted message and decrypt it.
+        
+        The ciphertext is read straight into a buffer borrowed from the
+        buffer pool and decrypted in place; the pool gets the buffer back
+        once the message has been copied out.
+        
+        Returns:
+            bytes: Decrypted message, or None if the connection closed first
+        """
+        with memoryview(self._header) as header:
+            if not self._receive_into(header):
+                return None
+        message_length = _LENGTH_PREFIX.unpack(self._header)[0]
+        
+        buffer = self.buffer_pool.acquire(message_length)
+        try:
+            with memoryview(buffer) as view, view[:message_length] as encrypted_message:
+                if not self._receive_into(encrypted_message):
+                    return None
+                
+                print(f"Received {message_length} encrypted bytes.")
+                return bytes(self.decrypt_message(encrypted_message, encrypted_message))
+        finally:
+            self.buffer_pool.release(buffer)
+    
     def close(self):
         """Close any open connections and sockets."""
         if self.connection and self.connection != self.socket:
@@ -127,6 +292,8 @@ class Sender(DESCommunicator):
         
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
+            # Set before connecting so the buffer sizes apply to the handshake
+            self._configure_socket(self.socket)
             self.socket.connect((self.host, self.port))
             self.connection = self.socket
             print(f"Connected to {self.host}:{self.port}")
@@ -157,14 +324,8 @@ class Sender(DESCommunicator):
             if message is None:
                 message = self.create_message()
             
-            # Encrypt message
-            encrypted = self.encrypt_message(message)
-            
-            # Send message length first
-            self.connection.sendall(len(encrypted).to_bytes(4, byteorder='big'))
-            
-            # Send encrypted message
-            self.connection.sendall(encrypted)
+            # Encrypt message into the frame and send it with its length
+            self._send_frame(message)
             
             print("Message sent successfully.")
             return True
@@ -184,32 +345,12 @@ class Sender(DESCommunicator):
             return None
         
         try:
-            # Receive message length first
-            length_bytes = self.connection.recv(4)
-            if not length_bytes:
+            # Receive the length-prefixed message and decrypt it
+            decrypted = self._receive_frame()
+            if decrypted is None:
                 print("Connection closed by receiver.")
                 return None
             
-            message_length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Receive encrypted message
-            encrypted_message = b''
-            remaining = message_length
-            
-            while remaining > 0:
-                chunk = self.connection.recv(min(4096, remaining))
-                if not chunk:
-                    print("Connection closed by receiver.")
-                    return None
-                
-                encrypted_message += chunk
-                remaining -= len(chunk)
-            
-            print(f"Received {len(encrypted_message)} encrypted bytes.")
-            
-            # Decrypt message
-            decrypted = self.decrypt_message(encrypted_message)
-            
             # Display message
             self.display_message(decrypted)
             
@@ -234,6 +375,7 @@ class Receiver(DESCommunicator):
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._configure_socket(self.socket)
             self.socket.bind((self.host, self.port))
             self.socket.listen(1)
             print(f"Listening on {self.host}:{self.port}")
@@ -256,6 +398,8 @@ class Receiver(DESCommunicator):
         print("Waiting for connection...")
         try:
             self.connection, addr = self.socket.accept()
+            # Options are not reliably inherited from the listening socket
+            self._configure_socket(self.connection)
             print(f"Connection from {addr[0]}:{addr[1]}")
             return True
         except Exception as e:
@@ -274,32 +418,12 @@ class Receiver(DESCommunicator):
             return None
         
         try:
-            # Receive message length first
-            length_bytes = self.connection.recv(4)
-            if not length_bytes:
+            # Receive the length-prefixed message and decrypt it
+            decrypted = self._receive_frame()
+            if decrypted is None:
                 print("Connection closed by sender.")
                 return None
             
-            message_length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Receive encrypted message
-            encrypted_message = b''
-            remaining = message_length
-            
-            while remaining > 0:
-                chunk = self.connection.recv(min(4096, remaining))
-                if not chunk:
-                    print("Connection closed by sender.")
-                    return None
-                
-                encrypted_message += chunk
-                remaining -= len(chunk)
-            
-            print(f"Received {len(encrypted_message)} encrypted bytes.")
-            
-            # Decrypt message
-            decrypted = self.decrypt_message(encrypted_message)
-            
             # Display message
             self.display_message(decrypted)
             
@@ -327,14 +451,8 @@ class Receiver(DESCommunicator):
             if message is None:
                 message = self.create_message()
             
-            # Encrypt message
-            encrypted = self.encrypt_message(message)
-            
-            # Send message length first
-            self.connection.sendall(len(encrypted).to_bytes(4, byteorder='big'))
-            
-            # Send encrypted message
-            self.connection.sendall(encrypted)
+            # Encrypt message into the frame and send it with its length
+            self._send_frame(message)
             
             print("Message sent successfully.")
             return True
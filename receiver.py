@@ -8,44 +8,137 @@ It can receive encrypted messages from a sender and send encrypted messages to i
 Usage:
     python receiver.py [OPTIONS]
 
+The script only needs the standard library, so it can equally be run with
+PyPy (pypy3 receiver.py [OPTIONS]), whose JIT compiler may speed up encryption.
+
 Options:
-    --host HOST      Host address to listen on (default: 0.0.0.0)
-    --port PORT      Port to listen on (default: 12345)
-    --debug          Enable debug output
-    --help           Show this help message
+    --host HOST           Host address to listen on (default: 0.0.0.0)
+    --port PORT           Port to listen on (default: 12345)
+    --debug               Enable debug output
+    --no-nodelay          Leave Nagle's algorithm enabled (TCP_NODELAY is set by default)
+    --sndbuf BYTES        Socket send buffer size (default: system default)
+    --rcvbuf BYTES        Socket receive buffer size (default: system default)
+    --pool-buffers N      Number of reusable message buffers kept (default: 8)
+    --buffer-size BYTES   Size of each reusable message buffer (default: 65536)
+    --key KEY             8-character encryption key (prompted for if omitted)
+    --action ACTION       Run without the menu: send, receive, or loop
+                          (send, or receive and echo each message back)
+    --message FILE        Message to send for --action send ('-' for stdin)
+    --count N             Number of times to run --action (default: 1)
+    --help                Show this help message
 """
 
 import sys
 import argparse
-import time
-from network_communication import Receiver
+import logging
+from network_communication import Receiver, BufferPool
+
+def key_argument(value):
+    """Validate an encryption key given on the command line."""
+    if len(value) != 8:
+        raise argparse.ArgumentTypeError("key must be exactly 8 characters")
+    return value
+
+def read_message(path):
+    """Read the message to send from a file, or from stdin if path is '-'."""
+    if path == "-":
+        return sys.stdin.buffer.read()
+    with open(path, "rb") as f:
+        return f.read()
 
 def parse_arguments():
-    """Parse command line arguments."""
+    """Parse command line arguments, reading the --message file if given."""
     parser = argparse.ArgumentParser(description="DES Receiver")
     parser.add_argument("--host", default="0.0.0.0", help="Host address to listen on")
     parser.add_argument("--port", type=int, default=12345, help="Port to listen on")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
-    return parser.parse_args()
+    parser.add_argument("--nodelay", dest="nodelay", action="store_true", default=True,
+                        help="Disable Nagle's algorithm (default)")
+    parser.add_argument("--no-nodelay", dest="nodelay", action="store_false",
+                        help="Leave Nagle's algorithm enabled")
+    parser.add_argument("--sndbuf", type=int, default=None, metavar="BYTES",
+                        help="Socket send buffer size in bytes")
+    parser.add_argument("--rcvbuf", type=int, default=None, metavar="BYTES",
+                        help="Socket receive buffer size in bytes")
+    parser.add_argument("--pool-buffers", type=int, default=8, metavar="N",
+                        help="Number of reusable message buffers kept")
+    parser.add_argument("--buffer-size", type=int, default=64 * 1024, metavar="BYTES",
+                        help="Size of each reusable message buffer in bytes")
+    parser.add_argument("--key", type=key_argument,
+                        help="8-character encryption key (prompted for if omitted)")
+    parser.add_argument("--action", choices=("send", "receive", "loop"),
+                        help="Run without the menu: send, receive, or loop "
+                             "(send, or receive and echo each message back)")
+    parser.add_argument("--message", metavar="FILE",
+                        help="File holding the message to send ('-' for stdin)")
+    parser.add_argument("--count", type=int, default=1, metavar="N",
+                        help="Number of times to run --action")
+    args = parser.parse_args()
+    if args.action == "send" and args.message is None:
+        parser.error("--message is required for --action send")
+    
+    # Read the message up front, so a missing or unreadable file is reported
+    # as a usage error before connecting
+    if args.message is not None:
+        try:
+            args.message = read_message(args.message)
+        except OSError as e:
+            parser.error(f"argument --message: can't read '{args.message}': {e.strerror}")
+    return args
+
+def run_action(receiver, action, message, count):
+    """
+    Run one operation count times without prompting.
+    
+    Args:
+        receiver (Receiver): Receiver with an accepted connection
+        action (str): "send", "receive", or "loop" (receive, then send the
+            same message back)
+        message (bytes): Message to send, for "send"
+        count (int): Number of repetitions
+        
+    Returns:
+        bool: True if every operation succeeded
+    """
+    for _ in range(count):
+        if action == "send":
+            if not receiver.send_message(message):
+                return False
+            continue
+        
+        received = receiver.receive_message()
+        if received is None:
+            return False
+        if action == "loop" and not receiver.send_message(received):
+            return False
+    return True
 
 def main():
     """Main function."""
     args = parse_arguments()
     
+    # Debug traces from the DES and network modules go through logging
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+    
     print("=== DES Encryption/Decryption System - Receiver ===")
     print(f"Listening on host: {args.host}")
     print(f"Listening on port: {args.port}")
     print(f"Debug mode: {'Enabled' if args.debug else 'Disabled'}")
     
-    # Get encryption key
-    while True:
+    # Get encryption key, unless it was given on the command line
+    key = args.key
+    while key is None:
         key = input("\nEnter 8-character encryption key: ")
-        if len(key) == 8:
-            break
-        print("Error: Key must be exactly 8 characters.")
+        if len(key) != 8:
+            print("Error: Key must be exactly 8 characters.")
+            key = None
     
-    # Create receiver
-    receiver = Receiver(key.encode('utf-8'), args.host, args.port, debug=args.debug)
+    # Create receiver, with message buffers reused across messages
+    buffer_pool = BufferPool(args.pool_buffers, args.buffer_size)
+    receiver = Receiver(key.encode('utf-8'), args.host, args.port, debug=args.debug,
+                        nodelay=args.nodelay, sndbuf=args.sndbuf, rcvbuf=args.rcvbuf,
+                        buffer_pool=buffer_pool)
     
     # Main loop
     try:
@@ -60,6 +153,13 @@ def main():
         
         print("\nConnection established. Ready to communicate.")
         
+        # Non-interactive use: run the requested operation and exit
+        if args.action:
+            if not run_action(receiver, args.action, args.message, args.count):
+                print("Stopped after a failed operation.")
+                sys.exit(1)
+            return
+        
         while True:
             print("\nOptions:")
             print("1. Receive message")
@@ -8,44 +8,130 @@ It can send encrypted messages to a receiver and receive encrypted messages from
 Usage:
     python sender.py [OPTIONS]
 
+The script only needs the standard library, so it can equally be run with
+PyPy (pypy3 sender.py [OPTIONS]), whose JIT compiler may speed up encryption.
+
 Options:
-    --host HOST      Receiver's host address (default: localhost)
-    --port PORT      Receiver's port (default: 12345)
-    --debug          Enable debug output
-    --help           Show this help message
+    --host HOST           Receiver's host address (default: localhost)
+    --port PORT           Receiver's port (default: 12345)
+    --debug               Enable debug output
+    --no-nodelay          Leave Nagle's algorithm enabled (TCP_NODELAY is set by default)
+    --sndbuf BYTES        Socket send buffer size (default: system default)
+    --rcvbuf BYTES        Socket receive buffer size (default: system default)
+    --pool-buffers N      Number of reusable message buffers kept (default: 8)
+    --buffer-size BYTES   Size of each reusable message buffer (default: 65536)
+    --key KEY             8-character encryption key (prompted for if omitted)
+    --action ACTION       Run without the menu: send, receive, or loop
+                          (send, or send then receive the reply)
+    --message FILE        Message to send for --action send or loop ('-' for stdin)
+    --count N             Number of times to run --action (default: 1)
+    --help                Show this help message
 """
 
 import sys
 import argparse
-import time
-from network_communication import Sender
+import logging
+from network_communication import Sender, BufferPool
+
+def key_argument(value):
+    """Validate an encryption key given on the command line."""
+    if len(value) != 8:
+        raise argparse.ArgumentTypeError("key must be exactly 8 characters")
+    return value
+
+def read_message(path):
+    """Read the message to send from a file, or from stdin if path is '-'."""
+    if path == "-":
+        return sys.stdin.buffer.read()
+    with open(path, "rb") as f:
+        return f.read()
 
 def parse_arguments():
-    """Parse command line arguments."""
+    """Parse command line arguments, reading the --message file if given."""
     parser = argparse.ArgumentParser(description="DES Sender")
     parser.add_argument("--host", default="localhost", help="Receiver's host address")
     parser.add_argument("--port", type=int, default=12345, help="Receiver's port")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
-    return parser.parse_args()
+    parser.add_argument("--nodelay", dest="nodelay", action="store_true", default=True,
+                        help="Disable Nagle's algorithm (default)")
+    parser.add_argument("--no-nodelay", dest="nodelay", action="store_false",
+                        help="Leave Nagle's algorithm enabled")
+    parser.add_argument("--sndbuf", type=int, default=None, metavar="BYTES",
+                        help="Socket send buffer size in bytes")
+    parser.add_argument("--rcvbuf", type=int, default=None, metavar="BYTES",
+                        help="Socket receive buffer size in bytes")
+    parser.add_argument("--pool-buffers", type=int, default=8, metavar="N",
+                        help="Number of reusable message buffers kept")
+    parser.add_argument("--buffer-size", type=int, default=64 * 1024, metavar="BYTES",
+                        help="Size of each reusable message buffer in bytes")
+    parser.add_argument("--key", type=key_argument,
+                        help="8-character encryption key (prompted for if omitted)")
+    parser.add_argument("--action", choices=("send", "receive", "loop"),
+                        help="Run without the menu: send, receive, or loop "
+                             "(send, or send then receive the reply)")
+    parser.add_argument("--message", metavar="FILE",
+                        help="File holding the message to send ('-' for stdin)")
+    parser.add_argument("--count", type=int, default=1, metavar="N",
+                        help="Number of times to run --action")
+    args = parser.parse_args()
+    if args.action in ("send", "loop") and args.message is None:
+        parser.error("--message is required for --action send or loop")
+    
+    # Read the message up front, so a missing or unreadable file is reported
+    # as a usage error before connecting
+    if args.message is not None:
+        try:
+            args.message = read_message(args.message)
+        except OSError as e:
+            parser.error(f"argument --message: can't read '{args.message}': {e.strerror}")
+    return args
+
+def run_action(sender, action, message, count):
+    """
+    Run one operation count times without prompting.
+    
+    Args:
+        sender (Sender): Connected sender
+        action (str): "send", "receive", or "loop" (send, then receive the reply)
+        message (bytes): Message to send, for "send" and "loop"
+        count (int): Number of repetitions
+        
+    Returns:
+        bool: True if every operation succeeded
+    """
+    for _ in range(count):
+        if action in ("send", "loop") and not sender.send_message(message):
+            return False
+        if action in ("receive", "loop") and sender.receive_message() is None:
+            return False
+    return True
 
 def main():
     """Main function."""
     args = parse_arguments()
     
+    # Debug traces from the DES and network modules go through logging
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+    
     print("=== DES Encryption/Decryption System - Sender ===")
     print(f"Receiver host: {args.host}")
     print(f"Receiver port: {args.port}")
     print(f"Debug mode: {'Enabled' if args.debug else 'Disabled'}")
     
-    # Get encryption key
-    while True:
+    # Get encryption key, unless it was given on the command line
+    key = args.key
+    while key is None:
         key = input("\nEnter 8-character encryption key: ")
-        if len(key) == 8:
-            break
-        print("Error: Key must be exactly 8 characters.")
+        if len(key) != 8:
+            print("Error: Key must be exactly 8 characters.")
+            key = None
     
-    # Create sender
-    sender = Sender(key.encode('utf-8'), args.host, args.port, debug=args.debug)
+    # Create sender, with message buffers reused across messages
+    buffer_pool = BufferPool(args.pool_buffers, args.buffer_size)
+    sender = Sender(key.encode('utf-8'), args.host, args.port, debug=args.debug,
+                    nodelay=args.nodelay, sndbuf=args.sndbuf, rcvbuf=args.rcvbuf,
+                    buffer_pool=buffer_pool)
     
     # Main loop
     try:
@@ -53,6 +139,13 @@ def main():
             print("Failed to connect. Exiting.")
             return
         
+        # Non-interactive use: run the requested operation and exit
+        if args.action:
+            if not run_action(sender, args.action, args.message, args.count):
+                print("Stopped after a failed operation.")
+                sys.exit(1)
+            return
+        
         while True:
             print("\nOptions:")
             print("1. Send message")
@@ -6,53 +6,55 @@ This script tests the DES implementation to verify that all transformations
 are working correctly according to the specifications.
 
 Usage:
-    python test_des.py
+    python test_des.py [--quiet]
+
+    --quiet    Hide the step-by-step debug traces of the DES internals
 """
 
-from des import DES
-import binascii
+from des import DES, get_des
+from network_communication import BufferPool, Sender
+import logging
+import socket
+import sys
+import threading
+
+# A DES instance keeps no per-call state, so the tests share these rather
+# than recomputing the key schedule in every test
+_DES = DES(b"TESTKEY!")
+_DES_DEBUG = DES(b"TESTKEY!", debug=True)
 
-def print_bits(bits, width=8, title=None):
-    """Print bit array in readable format."""
+def print_bits(value, size, width=8, title=None):
+    """Print a size-bit integer as groups of bits in readable format."""
     if title:
         print(f"{title}:")
     
-    for i in range(0, len(bits), width):
-        chunk = bits[i:i+width]
-        print(''.join(str(bit) for bit in chunk), end=' ')
-    print()
+    bits = format(value, f"0{size}b")
+    print(' '.join(bits[i:i+width] for i in range(0, size, width)))
 
 def test_initial_permutation():
     """Test the initial permutation."""
     print("\n=== Testing Initial Permutation ===")
     
     # Test vector - 64 bits
-    test_block = [0, 0, 0, 0, 0, 0, 0, 1,   # 01
-                  0, 0, 1, 0, 0, 0, 1, 1,   # 23
-                  0, 1, 0, 0, 0, 1, 0, 1,   # 45
-                  0, 1, 1, 0, 0, 1, 1, 1,   # 67
-                  1, 0, 0, 0, 1, 0, 0, 1,   # 89
-                  1, 0, 1, 0, 1, 0, 1, 1,   # AB
-                  1, 1, 0, 0, 1, 1, 0, 1,   # CD
-                  1, 1, 1, 0, 1, 1, 1, 1]   # EF
+    test_block = 0x0123456789ABCDEF
     
-    # Create DES instance
-    des = DES(b"TESTKEY!", debug=True)
+    # Shared DES instance
+    des = _DES_DEBUG
     
     # Apply permutation
     print("Input block:")
-    print_bits(test_block)
+    print_bits(test_block, 64)
     
     permuted = des._initial_permutation(test_block)
     
     print("\nOutput after IP:")
-    print_bits(permuted)
+    print_bits(permuted, 64)
     
     # Apply inverse permutation to check
     original = des._inverse_initial_permutation(permuted)
     
     print("\nOutput after IP^-1 (should match input):")
-    print_bits(original)
+    print_bits(original, 64)
     
     # Verify
     assert original == test_block, "Initial permutation test failed"
@@ -63,25 +65,22 @@ def test_expansion():
     print("\n=== Testing Expansion Permutation ===")
     
     # Test vector - 32 bits
-    test_block = [1, 1, 0, 0, 1, 1, 0, 0,
-                  1, 0, 1, 0, 1, 0, 1, 0,
-                  0, 1, 0, 1, 0, 1, 0, 1,
-                  1, 1, 1, 1, 0, 0, 0, 0]
+    test_block = 0b11001100_10101010_01010101_11110000
     
-    # Create DES instance
-    des = DES(b"TESTKEY!", debug=True)
+    # Shared DES instance
+    des = _DES_DEBUG
     
     # Apply expansion
     print("Input block (32 bits):")
-    print_bits(test_block)
+    print_bits(test_block, 32)
     
     expanded = des._expansion(test_block)
     
     print("\nOutput after expansion (48 bits):")
-    print_bits(expanded, width=6)
+    print_bits(expanded, 48, width=6)
     
     # Expected size
-    assert len(expanded) == 48, "Expansion test failed - wrong output size"
+    assert expanded >> 48 == 0, "Expansion test failed - wrong output size"
     print("\nExpansion test passed!")
 
 def test_key_generation():
@@ -92,25 +91,26 @@ def test_key_generation():
     key = b"TESTKEY!"
     des = DES(key, debug=True)
     
-    print(f"Master Key: {key.decode()} ({binascii.hexlify(key).decode()})")
+    print(f"Master Key: {key.decode()} ({key.hex()})")
     
     # Print PC-1 output
-    key_bits = des._bytes_to_bit_array(key)
-    pc1_out = des._permuted_choice_1(key_bits)
+    pc1_out = des._permuted_choice_1(int.from_bytes(key, 'big'))
     
     print("\nPC-1 Output (56 bits):")
-    print_bits(pc1_out, width=7)
+    print_bits(pc1_out, 56, width=7)
     
     # Print the first few round keys
     for i in range(3):  # Just show first 3 keys to save space
         print(f"\nRound Key {i+1} (48 bits):")
-        print_bits(des.subkeys[i], width=6)
+        print_bits(des.subkeys[i], 48, width=6)
     
     # Verify we have 16 round keys
     assert len(des.subkeys) == 16, "Key generation test failed - wrong number of keys"
     # Verify each key is 48 bits
     for subkey in des.subkeys:
-        assert len(subkey) == 48, "Key generation test failed - wrong key size"
+        assert subkey >> 48 == 0, "Key generation test failed - wrong key size"
+    # Verify the precomputed schedule matches the step-by-step (debug) one
+    assert _DES.subkeys == des.subkeys, "Key generation test failed - schedules disagree"
     
     print("\nKey generation test passed!")
 
@@ -118,30 +118,33 @@ def test_s_box():
     """Test S-box substitution."""
     print("\n=== Testing S-box Substitution ===")
     
-    # Test vector - 48 bits (six 6-bit blocks)
-    test_block = [0, 0, 1, 1, 1, 1,  # S1: row 0, col 15 -> 7
-                  1, 0, 1, 0, 1, 0,  # S2: row 2, col 5 -> 13
-                  0, 0, 0, 0, 0, 0,  # S3: row 0, col 0 -> 10
-                  1, 1, 1, 1, 0, 0,  # S4: row 1, col 14 -> 14
-                  1, 0, 1, 0, 1, 1,  # S5: row 3, col 5 -> 3
-                  0, 1, 0, 1, 0, 1,  # S6: row 1, col 10 -> 11
-                  1, 1, 0, 0, 1, 1,  # S7: row 3, col 6 -> 8
-                  0, 1, 1, 1, 1, 0]  # S8: row 2, col 7 -> 1
-    
-    # Create DES instance
-    des = DES(b"TESTKEY!", debug=True)
+    # Test vector - 48 bits (eight 6-bit groups)
+    groups = [0b001111,  # S1: row 0, col 15 -> 7
+              0b101010,  # S2: row 2, col 5 -> 13
+              0b000000,  # S3: row 0, col 0 -> 10
+              0b111100,  # S4: row 1, col 14 -> 14
+              0b101011,  # S5: row 3, col 5 -> 3
+              0b010101,  # S6: row 1, col 10 -> 11
+              0b110011,  # S7: row 3, col 6 -> 8
+              0b011110]  # S8: row 2, col 7 -> 1
+    test_block = 0
+    for group in groups:
+        test_block = (test_block << 6) | group
+    
+    # Shared DES instance
+    des = _DES_DEBUG
     
     # Apply S-box substitution
     print("Input block (48 bits):")
-    print_bits(test_block, width=6)
+    print_bits(test_block, 48, width=6)
     
     substituted = des._s_box_substitution(test_block)
     
     print("\nOutput after S-box substitution (32 bits):")
-    print_bits(substituted)
+    print_bits(substituted, 32)
     
     # Verify size
-    assert len(substituted) == 32, "S-box test failed - wrong output size"
+    assert substituted >> 32 == 0, "S-box test failed - wrong output size"
     print("\nS-box test passed!")
 
 def test_permutation_p():
@@ -149,25 +152,22 @@ def test_permutation_p():
     print("\n=== Testing Permutation P ===")
     
     # Test vector - 32 bits
-    test_block = [1, 0, 1, 0, 1, 0, 1, 0,
-                  0, 1, 0, 1, 0, 1, 0, 1,
-                  1, 1, 0, 0, 1, 1, 0, 0,
-                  0, 0, 1, 1, 1, 1, 0, 0]
+    test_block = 0b10101010_01010101_11001100_00111100
     
-    # Create DES instance
-    des = DES(b"TESTKEY!", debug=True)
+    # Shared DES instance
+    des = _DES_DEBUG
     
     # Apply P permutation
     print("Input block:")
-    print_bits(test_block)
+    print_bits(test_block, 32)
     
     permuted = des._permutation_p(test_block)
     
     print("\nOutput after P:")
-    print_bits(permuted)
+    print_bits(permuted, 32)
     
     # Verify size
-    assert len(permuted) == 32, "Permutation P test failed - wrong output size"
+    assert permuted >> 32 == 0, "Permutation P test failed - wrong output size"
     print("\nPermutation P test passed!")
 
 def test_f_function():
@@ -175,31 +175,31 @@ def test_f_function():
     print("\n=== Testing Feistel Function ===")
     
     # Test vector - 32 bits
-    test_block = [1, 0, 1, 0, 1, 0, 1, 0,
-                  0, 1, 0, 1, 0, 1, 0, 1,
-                  1, 1, 0, 0, 1, 1, 0, 0,
-                  0, 0, 1, 1, 1, 1, 0, 0]
+    test_block = 0b10101010_01010101_11001100_00111100
     
-    # Create DES instance
-    des = DES(b"TESTKEY!", debug=True)
+    # Shared DES instance
+    des = _DES_DEBUG
     
     # Use first round key
     subkey = des.subkeys[0]
     
     # Apply f function
     print("Input block (32 bits):")
-    print_bits(test_block)
+    print_bits(test_block, 32)
     
     print("\nSubkey (48 bits):")
-    print_bits(subkey, width=6)
+    print_bits(subkey, 48, width=6)
     
     f_result = des._f_function(test_block, subkey)
     
     print("\nOutput of f function (32 bits):")
-    print_bits(f_result)
+    print_bits(f_result, 32)
     
     # Verify size
-    assert len(f_result) == 32, "f function test failed - wrong output size"
+    assert f_result >> 32 == 0, "f function test failed - wrong output size"
+    # Verify the SP-table path matches the step-by-step (debug) path
+    fast_result = _DES._f_function(test_block, subkey)
+    assert fast_result == f_result, "f function test failed - SP tables disagree"
     print("\nf function test passed!")
 
 def test_des_round():
@@ -207,45 +207,38 @@ def test_des_round():
     print("\n=== Testing DES Round ===")
     
     # Test vectors - 32 bits each for left and right
-    left = [1, 0, 1, 0, 1, 0, 1, 0,
-            0, 1, 0, 1, 0, 1, 0, 1,
-            1, 1, 0, 0, 1, 1, 0, 0,
-            0, 0, 1, 1, 1, 1, 0, 0]
+    left = 0b10101010_01010101_11001100_00111100
+    right = 0b01010101_10101010_00110011_11000011
     
-    right = [0, 1, 0, 1, 0, 1, 0, 1,
-             1, 0, 1, 0, 1, 0, 1, 0,
-             0, 0, 1, 1, 0, 0, 1, 1,
-             1, 1, 0, 0, 0, 0, 1, 1]
-    
-    # Create DES instance
-    des = DES(b"TESTKEY!", debug=True)
+    # Shared DES instance
+    des = _DES_DEBUG
     
     # Use first round key
     subkey = des.subkeys[0]
     
     # Print inputs
     print("Left input (32 bits):")
-    print_bits(left)
+    print_bits(left, 32)
     
     print("\nRight input (32 bits):")
-    print_bits(right)
+    print_bits(right, 32)
     
     print("\nSubkey (48 bits):")
-    print_bits(subkey, width=6)
+    print_bits(subkey, 48, width=6)
     
     # Apply round
     new_left, new_right = des._des_round(left, right, subkey)
     
     # Print outputs
     print("\nNew left output (32 bits):")
-    print_bits(new_left)
+    print_bits(new_left, 32)
     
     print("\nNew right output (32 bits):")
-    print_bits(new_right)
+    print_bits(new_right, 32)
     
     # Verify structure
     assert new_left == right, "DES round test failed - new left should be old right"
-    assert len(new_right) == 32, "DES round test failed - wrong output size"
+    assert new_right >> 32 == 0, "DES round test failed - wrong output size"
     print("\nDES round test passed!")
 
 def test_encrypt_decrypt():
@@ -257,14 +250,14 @@ def test_encrypt_decrypt():
     key = b"SECRET!!"
     
     print(f"Plaintext: {plaintext.decode()}")
-    print(f"Key: {key.decode()} ({binascii.hexlify(key).decode()})")
+    print(f"Key: {key.decode()} ({key.hex()})")
     
     # Create DES instance
     des = DES(key)
     
     # Encrypt
     ciphertext = des.encrypt(plaintext)
-    print(f"\nCiphertext (hex): {binascii.hexlify(ciphertext).decode()}")
+    print(f"\nCiphertext (hex): {ciphertext.hex()}")
     
     # Decrypt
     decrypted = des.decrypt(ciphertext)
@@ -274,8 +267,151 @@ def test_encrypt_decrypt():
     assert decrypted == plaintext, "Encryption/decryption test failed"
     print("\nEncryption/decryption test passed!")
 
+def test_bitsliced():
+    """Test that bulk (bitsliced) encryption matches block-by-block encryption."""
+    print("\n=== Testing Bitsliced Bulk Encryption ===")
+    
+    # 10279 bytes pad to 1285 blocks: above the bulk threshold and not a
+    # multiple of the 8-block transpose width
+    plaintext = bytes(range(256)) * 40 + b"bitsliced" * 4 + b"DES"
+    des = DES(b"SECRET!!")
+    
+    ciphertext = des.encrypt(plaintext)
+    print(f"Plaintext: {len(plaintext)} bytes, ciphertext: {len(ciphertext)} bytes")
+    
+    # Compare against the per-block path
+    padded = plaintext + bytes([8 - len(plaintext) % 8]) * (8 - len(plaintext) % 8)
+    for i in range(0, len(padded), 8):
+        block = int.from_bytes(padded[i:i+8], 'big')
+        expected = des.encrypt_block(block).to_bytes(8, 'big')
+        assert ciphertext[i:i+8] == expected, f"Bitsliced test failed - block {i // 8} differs"
+    
+    # Verify
+    assert des.decrypt(ciphertext) == plaintext, "Bitsliced test failed - wrong plaintext"
+    print("\nBitsliced test passed!")
+
+def test_known_answer():
+    """Test encryption against a published DES test vector."""
+    print("\n=== Testing Known-Answer Vector ===")
+    
+    # Classic worked example: key 133457799BBCDFF1, plaintext 0123456789ABCDEF
+    key = bytes.fromhex("133457799BBCDFF1")
+    plaintext = bytes.fromhex("0123456789ABCDEF")
+    expected = bytes.fromhex("85E813540F0AB405")
+    
+    des = DES(key)
+    
+    ciphertext = des.encrypt(plaintext)
+    print(f"Ciphertext (hex): {ciphertext.hex()}")
+    print(f"Expected (hex):   {expected.hex()}")
+    
+    # The traced step-by-step implementation must agree with the fast one
+    traced = DES(key, debug=True).encrypt(plaintext)
+    
+    # Verify
+    assert ciphertext == expected, "Known-answer test failed - wrong ciphertext"
+    assert traced == expected, "Known-answer test failed - debug path disagrees"
+    assert des.decrypt(ciphertext) == plaintext, "Known-answer test failed - wrong plaintext"
+    print("\nKnown-answer test passed!")
+
+def test_reuse():
+    """Test that reusing one DES instance gives stable results."""
+    print("\n=== Testing Cipher Reuse ===")
+    
+    first = b"First message"
+    # Long enough to take the bitsliced bulk path
+    second = b"A second, longer message" * 400
+    
+    expected = _DES.encrypt(first)
+    assert _DES.decrypt(_DES.encrypt(second)) == second, "Reuse test failed - wrong plaintext"
+    assert _DES.encrypt(first) == expected, "Reuse test failed - result changed after reuse"
+    assert _DES_DEBUG.encrypt(first) == expected, "Reuse test failed - debug path differs"
+    print("\nReuse test passed!")
+
+def test_encrypt_into():
+    """Test encrypting and decrypting into caller-provided buffers."""
+    print("\n=== Testing Encryption Into Buffers ===")
+    
+    # A short message and one long enough for the bitsliced bulk path
+    for message in (b"Hello, World!", b"A second, longer message" * 400):
+        size = _DES.encrypted_length(len(message))
+        buffer = bytearray(size + 4)
+        
+        # Encrypt after a 4-byte header, as the network framing does
+        with memoryview(buffer) as view:
+            assert _DES.encrypt_into(message, view[4:]) == size, "Into test failed - wrong length"
+        assert buffer[4:] == _DES.encrypt(message), "Into test failed - wrong ciphertext"
+        
+        # Decrypt in place
+        ciphertext = buffer[4:]
+        length = _DES.decrypt_into(ciphertext, ciphertext)
+        assert ciphertext[:length] == message, "Into test failed - wrong plaintext"
+    
+    print("\nEncryption into buffers test passed!")
+
+def test_get_des():
+    """Test that get_des reuses one cipher (and key schedule) per key."""
+    print("\n=== Testing Cached Cipher Instances ===")
+    
+    des = get_des(b"SECRET!!")
+    assert get_des(b"SECRET!!") is des, "Cache test failed - schedule rebuilt"
+    assert get_des(b"OTHERKEY") is not des, "Cache test failed - keys share a cipher"
+    assert get_des(b"SECRET!!", True) is not des, "Cache test failed - debug shares a cipher"
+    assert des.subkeys == DES(b"SECRET!!").subkeys, "Cache test failed - wrong subkeys"
+    print("\nCache test passed!")
+
+def test_framing():
+    """Test message framing through pooled buffers over a socket pair."""
+    print("\n=== Testing Message Framing and Buffer Pool ===")
+    
+    # release() keeps only buffer_size-sized buffers, at most count of them
+    pool = BufferPool(count=2, buffer_size=64)
+    oversized = pool.acquire(100)
+    assert len(oversized) == 100, "Framing test failed - oversized buffer too small"
+    pool.release(oversized)
+    pool.release(bytearray(32))
+    assert len(pool._free) == 0, "Framing test failed - pool kept a wrong-sized buffer"
+    for _ in range(3):
+        pool.release(bytearray(64))
+    assert len(pool._free) == 2, "Framing test failed - pool kept too many buffers"
+    
+    # Two communicators sharing the key, wired directly to each other
+    left, right = socket.socketpair()
+    sender = Sender(b"SECRET!!", "localhost", 0, buffer_pool=BufferPool(2, 64))
+    receiver = Sender(b"SECRET!!", "localhost", 0, buffer_pool=BufferPool(2, 64))
+    sender.connection = sender.socket = left
+    receiver.connection = receiver.socket = right
+    try:
+        # A short message fits a pooled buffer; a long one gets a one-off
+        # buffer, and its frame is larger than one recv can return
+        for message in (b"Hello, World!", bytes(range(256)) * 1000):
+            # Send from a thread, since the socket buffer cannot hold the
+            # whole long frame before the receiver starts reading
+            sending = threading.Thread(target=sender._send_frame, args=(message,))
+            sending.start()
+            received = receiver._receive_frame()
+            sending.join()
+            assert received == message, "Framing test failed - wrong message"
+            assert len(receiver.buffer_pool._free) <= 2, "Framing test failed - pool overfilled"
+        print("Short and oversized messages round-tripped")
+        
+        # A connection closed partway through the length prefix
+        left.sendall(b"\x00\x00")
+        left.close()
+        assert receiver._receive_frame() is None, "Framing test failed - truncated header accepted"
+    finally:
+        sender.close()
+        receiver.close()
+    
+    print("\nFraming test passed!")
+
 def main():
     """Main test function."""
+    # The debug=True ciphers log every intermediate value at DEBUG level
+    quiet = "--quiet" in sys.argv[1:]
+    logging.basicConfig(level=logging.WARNING if quiet else logging.DEBUG,
+                        format="%(message)s", stream=sys.stdout)
+    
     print("=== DES Algorithm Test Suite ===")
     
     # Run all tests
@@ -287,6 +423,12 @@ def main():
     test_f_function()
     test_des_round()
     test_encrypt_decrypt()
+    test_bitsliced()
+    test_known_answer()
+    test_reuse()
+    test_encrypt_into()
+    test_get_des()
+    test_framing()
     
     print("\n=== All tests passed! ===")
 